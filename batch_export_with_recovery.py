@@ -1,70 +1,34 @@
 from pytubefix import Channel
-import json
-import re
 import os
+import random
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from datetime import datetime
 
-
-def find_last_completed_batch(output_dir, safe_name):
+from batch_io import (
+    SOA_FIELDS,
+    export_parquet,
+    extract_video,
+    invalidate_channel_cache,
+    iter_batch_files,
+    load_channel_cache,
+    read_batch_meta,
+    save_channel_cache,
+    validate_batch_file,
+    write_batch_file,
+)
+
+
+def _retry_sleep(attempt):
     """
-    Find the highest completed batch number
-    Returns the batch number to start from (last_completed + 1)
+    Wait before the next retry: exponential backoff (1, 2, 4, ... up to 60 seconds)
+    plus up to 1 second of random jitter so retries don't fire in lockstep
     """
-    if not os.path.exists(output_dir):
-        return 1  # Start from batch 1 if directory doesn't exist
-
-    completed_batches = []
-
-    # Look for existing batch files
-    for filename in os.listdir(output_dir):
-        if filename.startswith(f"{safe_name}_") and filename.endswith(".json"):
-            try:
-                # Extract batch number from filename like "AZ_Alkmaar_videos_005.json"
-                batch_part = filename.replace(f"{safe_name}_", "").replace(".json", "")
-                batch_num = int(batch_part)
-                completed_batches.append(batch_num)
-            except ValueError:
-                continue
-
-    if completed_batches:
-        last_completed = max(completed_batches)
-        print(f"Found existing batches: {sorted(completed_batches)}")
-        print(f"Last completed batch: {last_completed}")
-        return last_completed + 1
-    else:
-        return 1  # No existing batches found
-
-
-def validate_batch_file(filepath, min_success_rate=0.8):
-    """
-    Check if a batch file is complete and valid
-    min_success_rate: Minimum percentage of successful videos required (0.8 = 80%)
-    """
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Check if it has the expected structure
-        if "batch_info" in data and "videos" in data:
-            videos = data["videos"]
-            if not videos:
-                return False
-
-            # Count successful vs error videos
-            error_videos = len(
-                [v for v in videos if v.get("title", "").startswith("ERROR:")]
-            )
-            success_videos = len(videos) - error_videos
-            success_rate = success_videos / len(videos) if videos else 0
-
-            # File is valid if success rate is above threshold
-            return success_rate >= min_success_rate
-
-        return False
-
-    except Exception:
-        return False
+    wait_time = min(60, 2**attempt) + random.uniform(0, 1)
+    print(f"Waiting {wait_time:.1f} seconds before retry...")
+    time.sleep(wait_time)
 
 
 def load_channel_safely(channel_url, max_retries=3):
@@ -88,9 +52,7 @@ def load_channel_safely(channel_url, max_retries=3):
         except Exception as e:
             print(f"❌ Attempt {attempt + 1} failed: {e}")
             if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5  # Progressive delay: 5, 10, 15 seconds
-                print(f"Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
+                _retry_sleep(attempt)
             else:
                 print("All attempts failed!")
                 raise e
@@ -104,9 +66,15 @@ def process_single_batch(
     output_dir,
     safe_name,
     max_retries=2,
+    pretty=False,
+    max_workers=16,
+    show_progress=True,
 ):
     """
     Process a single batch with error recovery
+    pretty: Indent the batch file for reading by hand (compact by default)
+    max_workers: Number of videos whose metadata is fetched concurrently
+    show_progress: Draw the progress bar (off when batches run side by side)
     Returns (success: bool, error_count: int, retry_needed: bool)
     """
 
@@ -121,112 +89,136 @@ def process_single_batch(
 
     # Progress bar setup
     progress_interval = max(1, len(current_batch) // 50)
-    print("Progress: [", end="", flush=True)
+    if show_progress:
+        print("Progress: [", end="", flush=True)
 
-    batch_videos = []
+    batch_videos = {column: [] for column in SOA_FIELDS.values()}
     error_count = 0
     consecutive_errors = 0
 
-    # Process each video
-    for i, yt_obj in enumerate(current_batch):
-        try:
-            # Show progress
-            if i % progress_interval == 0 or i == len(current_batch) - 1:
-                print("█", end="", flush=True)
+    # Extract video info in parallel; map() keeps results in batch order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(extract_video, current_batch, range(start_idx, end_idx))
 
-            # Extract video info
-            obj_repr = repr(yt_obj)
-            match = re.search(r"videoId=([a-zA-Z0-9_-]{11})", obj_repr)
-            video_id = match.group(1) if match else f"unknown_{start_idx + i}"
+        last_flush = time.monotonic()
 
-            # Get publish date
-            publish_date = None
-            try:
-                if hasattr(yt_obj, "publish_date") and yt_obj.publish_date:
-                    publish_date = yt_obj.publish_date.isoformat()
-            except:
-                pass
-
-            # Create video entry
-            video_data = {
-                "title": getattr(yt_obj, "title", "Unknown Title"),
-                "duration": getattr(yt_obj, "length", 0),
-                "video_id": video_id,
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-                "publish_date": publish_date,
-            }
-
-            batch_videos.append(video_data)
-            consecutive_errors = 0  # Reset consecutive error counter
+        for i, (video_data, failed) in enumerate(results):
+            # Show progress, flushing stdout at most every 0.2 seconds
+            if show_progress:
+                if i % progress_interval == 0 or i == len(current_batch) - 1:
+                    print("█", end="")
+                if time.monotonic() - last_flush > 0.2:
+                    sys.stdout.flush()
+                    last_flush = time.monotonic()
 
-        except Exception as e:
-            print("!", end="", flush=True)  # Error indicator
+            for field, column in SOA_FIELDS.items():
+                batch_videos[column].append(video_data[field])
+
+            if not failed:
+                consecutive_errors = 0  # Reset consecutive error counter
+                continue
+
+            if show_progress:
+                print("!", end="")  # Error indicator
             error_count += 1
             consecutive_errors += 1
 
-            # Create error entry
-            batch_videos.append(
-                {
-                    "title": f"ERROR: Failed to process video {start_idx + i + 1}",
-                    "duration": 0,
-                    "video_id": f"error_{start_idx + i}",
-                    "url": f"ERROR: {str(e)[:100]}",
-                    "publish_date": None,
-                }
-            )
-
             # If too many consecutive errors, suggest a retry
             if consecutive_errors >= 10:
-                print(f"\n⚠️  {consecutive_errors} consecutive errors detected!")
+                print(
+                    f"\n⚠️  Batch {batch_num}: {consecutive_errors} consecutive errors detected!"
+                )
+                executor.shutdown(wait=False, cancel_futures=True)
                 return False, error_count, True  # Signal retry needed
 
-            continue
-
-    print("] ✓")
+    if show_progress:
+        print("] ✓")
+    video_count = len(batch_videos["titles"])
 
     # Check error rate
     success_rate = (
-        (len(batch_videos) - error_count) / len(batch_videos) if batch_videos else 0
+        (video_count - error_count) / video_count if video_count else 0
     )
 
     # If error rate is too high, suggest retry
     if success_rate < 0.7:  # Less than 70% success
         print(
-            f"⚠️  High error rate: {error_count}/{len(batch_videos)} errors ({success_rate:.1%} success)"
+            f"⚠️  Batch {batch_num} high error rate: {error_count}/{video_count} errors ({success_rate:.1%} success)"
         )
         return False, error_count, True  # Signal retry needed
 
     # Create batch data
     batch_data = {
+        "schema_version": 2,
         "batch_info": {
             "batch_number": batch_num,
-            "videos_in_batch": len(batch_videos),
+            "videos_in_batch": video_count,
             "video_range": f"{start_idx + 1}-{end_idx}",
             "export_date": datetime.now().isoformat(),
             "error_count": error_count,
             "success_rate": success_rate,
         },
         "channel_info": channel_info,
-        "videos": batch_videos,
+        "videos_soa": batch_videos,
     }
 
     # Save batch file
-    with open(batch_filepath, "w", encoding="utf-8") as f:
-        json.dump(batch_data, f, indent=2, ensure_ascii=False)
+    write_batch_file(
+        batch_filepath,
+        batch_data,
+        {
+            "batch_number": batch_num,
+            "videos_in_batch": video_count,
+            "error_count": error_count,
+            "success_rate": success_rate,
+        },
+        pretty,
+    )
 
     # Show file info
     file_size = os.path.getsize(batch_filepath)
-    successful_videos = len(batch_videos) - error_count
+    successful_videos = video_count - error_count
     print(
-        f"   ✅ Saved: {batch_filename} ({successful_videos}/{len(batch_videos)} videos, {file_size // 1024:.0f} KB)"
+        f"   ✅ Saved: {batch_filename} ({successful_videos}/{video_count} videos, {file_size // 1024:.0f} KB)"
     )
 
     if error_count > 0:
-        print(f"   ⚠️  {error_count} errors in this batch")
+        print(f"   ⚠️  {error_count} errors in batch {batch_num}")
 
     return True, error_count, False  # Success, no retry needed
 
 
+def _reload_channel(channel_url):
+    """
+    Reload channel data to recover from connection issues before a retry
+    Returns (youtube_objects, channel_info)
+    """
+    channel, youtube_objects = load_channel_safely(channel_url)
+    channel_info = {
+        "name": channel.channel_name,
+        "url": channel_url,
+        "total_videos_in_channel": len(youtube_objects),
+    }
+    print("   ✅ Channel data reloaded successfully")
+    return youtube_objects, channel_info
+
+
+def _run_batch(batch_num, **batch_kwargs):
+    """
+    Worker for the concurrent first pass over the remaining batches
+    Channel reloads and retries are left to the sequential retry pass
+    Returns (batch_num, success: bool, retry_needed: bool)
+    """
+    try:
+        success, _, retry_needed = process_single_batch(
+            batch_num=batch_num, show_progress=False, **batch_kwargs
+        )
+    except Exception as e:
+        print(f"❌ Unexpected error in batch {batch_num}: {e}")
+        return batch_num, False, True
+    return batch_num, success, retry_needed
+
+
 def run_batch_export_with_error_recovery():
     """
     Batch export with comprehensive error recovery
@@ -238,6 +230,12 @@ def run_batch_export_with_error_recovery():
     output_dir = "./video_batches"
     safe_name = "AZ_Alkmaar_videos"
     max_batch_retries = 3
+    # Batches processed side by side; the videos of each batch are fetched on
+    # max_workers // batch_workers threads, so at most max_workers requests are
+    # in flight at once (kept low against throttling)
+    batch_workers = 4
+    max_workers = 16
+    output_format = "json"  # "parquet" also combines all batches into one file
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -245,6 +243,24 @@ def run_batch_export_with_error_recovery():
     print("🔴⚪ AZTV Video Batch Export with Error Recovery")
     print("=" * 60)
 
+    # A fresh cached listing whose batches are all valid on disk makes the
+    # (slow) live channel listing unnecessary
+    cache = load_channel_cache(output_dir, channel_url)
+    if cache is not None:
+        total_batches = (len(cache["video_urls"]) + batch_size - 1) // batch_size
+        existing = dict(iter_batch_files(output_dir, safe_name))
+        if all(
+            batch_num in existing and validate_batch_file(existing[batch_num].path)
+            for batch_num in range(1, total_batches + 1)
+        ):
+            print(f"Channel: {cache['channel_name']} (cached listing)")
+            print(f"All {total_batches} batches are already completed")
+            show_final_summary(output_dir, safe_name, total_batches)
+
+            if output_format == "parquet":
+                export_parquet(output_dir, safe_name, total_batches)
+            return
+
     # Initial channel load
     try:
         channel, youtube_objects = load_channel_safely(channel_url)
@@ -252,6 +268,8 @@ def run_batch_export_with_error_recovery():
         print(f"❌ Failed to load channel: {e}")
         return
 
+    save_channel_cache(output_dir, channel_url, channel.channel_name, youtube_objects)
+
     total_videos = len(youtube_objects)
     total_batches = (total_videos + batch_size - 1) // batch_size
 
@@ -266,41 +284,78 @@ def run_batch_export_with_error_recovery():
         "total_videos_in_channel": total_videos,
     }
 
-    # Check for existing batches and find where to resume
-    start_batch = find_last_completed_batch(output_dir, safe_name)
-
-    if start_batch > 1:
-        print(f"🔄 RESUMING from batch {start_batch}")
+    # Scan existing batches once. Batches finish out of order, so every batch
+    # number is checked rather than resuming after the highest one on disk.
+    existing = dict(iter_batch_files(output_dir, safe_name))
+    remaining_batches = []
+    for batch_num in range(1, total_batches + 1):
+        entry = existing.get(batch_num)
+        if entry is None or not validate_batch_file(entry.path):
+            remaining_batches.append(batch_num)
+
+    if not remaining_batches:
+        print(f"All {total_batches} batches are already completed")
+    elif len(remaining_batches) < total_batches:
+        print(
+            f"🔄 RESUMING: {len(remaining_batches)} batches left, "
+            f"first missing batch is {remaining_batches[0]}"
+        )
     else:
         print("🚀 STARTING fresh export")
 
     print(f"📁 Output: {output_dir}/")
     print("=" * 60)
 
-    # Process batches with error recovery
-    current_batch = start_batch
-
-    while current_batch <= total_batches:
-        batch_retry_count = 0
+    # First pass: batches are independent (own slice of youtube_objects, own
+    # file), so run them side by side. Threads rather than processes: the work
+    # is network-bound and the pytubefix objects are not cheap to pickle.
+    failed_batches = []
+    run_batch = partial(
+        _run_batch,
+        youtube_objects=youtube_objects,
+        batch_size=batch_size,
+        channel_info=channel_info,
+        output_dir=output_dir,
+        safe_name=safe_name,
+        max_workers=max(1, max_workers // batch_workers),
+    )
+    with ThreadPoolExecutor(max_workers=batch_workers) as pool:
+        futures = [pool.submit(run_batch, batch_num) for batch_num in remaining_batches]
+        for future in as_completed(futures):
+            batch_num, success, retry_needed = future.result()
+            if not success or retry_needed:
+                failed_batches.append(batch_num)
+
+    if failed_batches:
+        failed_batches.sort()
+        print(f"🔄 Retrying failed batches one at a time: {failed_batches}")
+        invalidate_channel_cache(output_dir)
+
+    # Second pass: retry failed batches sequentially with channel reloads
+    for current_batch in failed_batches:
+        # The failed first-pass attempt counts as attempt 1
+        batch_retry_count = 1
         batch_success = False
 
+        if batch_retry_count >= max_batch_retries:
+            print(f"❌ Batch {current_batch} failed after {max_batch_retries} retries")
+            continue
+
+        # Reload and back off before the first retry, like before every other
+        print(
+            f"🔄 Batch {current_batch} needs retry ({batch_retry_count}/{max_batch_retries})"
+        )
+        print("   Reloading channel data...")
+        try:
+            youtube_objects, channel_info = _reload_channel(channel_url)
+        except Exception as e:
+            print(f"   ❌ Failed to reload channel: {e}")
+            continue
+        _retry_sleep(batch_retry_count)
+
         # Retry loop for current batch
         while batch_retry_count < max_batch_retries and not batch_success:
             try:
-                # Skip if file already exists and is valid
-                batch_filename = f"{safe_name}_{current_batch:03d}.json"
-                batch_filepath = os.path.join(output_dir, batch_filename)
-
-                if os.path.exists(batch_filepath) and validate_batch_file(
-                    batch_filepath
-                ):
-                    file_size = os.path.getsize(batch_filepath)
-                    print(
-                        f"Batch {current_batch:2d}/{total_batches} | SKIPPED (already exists, {file_size // 1024:.0f} KB)"
-                    )
-                    batch_success = True
-                    break
-
                 # Process the batch
                 success, error_count, retry_needed = process_single_batch(
                     youtube_objects,
@@ -309,12 +364,14 @@ def run_batch_export_with_error_recovery():
                     channel_info,
                     output_dir,
                     safe_name,
+                    max_workers=max_workers,
                 )
 
                 if success and not retry_needed:
                     batch_success = True
                 else:
                     # Batch failed or needs retry
+                    invalidate_channel_cache(output_dir)
                     batch_retry_count += 1
 
                     if batch_retry_count < max_batch_retries:
@@ -325,16 +382,12 @@ def run_batch_export_with_error_recovery():
 
                         # Reload channel data to recover from any connection issues
                         try:
-                            channel, youtube_objects = load_channel_safely(channel_url)
-                            channel_info = {
-                                "name": channel.channel_name,
-                                "url": channel_url,
-                                "total_videos_in_channel": len(youtube_objects),
-                            }
-                            print("   ✅ Channel data reloaded successfully")
+                            youtube_objects, channel_info = _reload_channel(
+                                channel_url
+                            )
 
                             # Wait a bit before retrying
-                            time.sleep(5)
+                            _retry_sleep(batch_retry_count)
 
                         except Exception as e:
                             print(f"   ❌ Failed to reload channel: {e}")
@@ -348,24 +401,25 @@ def run_batch_export_with_error_recovery():
 
             except Exception as e:
                 print(f"❌ Unexpected error in batch {current_batch}: {e}")
+                invalidate_channel_cache(output_dir)
                 batch_retry_count += 1
 
                 if batch_retry_count < max_batch_retries:
                     print(f"Retrying batch {current_batch}...")
-                    time.sleep(5)
+                    _retry_sleep(batch_retry_count)
                 else:
                     print(f"Giving up on batch {current_batch}")
                     batch_success = True  # Allow continuation
 
-        # Move to next batch
-        current_batch += 1
-
     print("=" * 60)
     print("🎉 EXPORT COMPLETED!")
 
     # Show final summary
     show_final_summary(output_dir, safe_name, total_batches)
 
+    if output_format == "parquet":
+        export_parquet(output_dir, safe_name, total_batches)
+
 
 def show_final_summary(output_dir, safe_name, expected_batches):
     """Show final export summary"""
@@ -373,21 +427,20 @@ def show_final_summary(output_dir, safe_name, expected_batches):
     total_videos_exported = 0
     total_errors = 0
 
+    existing = dict(iter_batch_files(output_dir, safe_name))
+
     for batch_num in range(1, expected_batches + 1):
         batch_filename = f"{safe_name}_{batch_num:03d}.json"
-        batch_filepath = os.path.join(output_dir, batch_filename)
+        entry = existing.get(batch_num)
 
-        if os.path.exists(batch_filepath):
-            try:
-                with open(batch_filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    video_count = len(data.get("videos", []))
-                    error_count = data.get("batch_info", {}).get("error_count", 0)
-                    total_videos_exported += video_count
-                    total_errors += error_count
-                    completed_files.append((batch_filename, video_count, error_count))
-            except:
-                pass
+        if entry is not None:
+            meta = read_batch_meta(entry.path)
+            if meta is not None:
+                video_count = meta["videos_in_batch"]
+                error_count = meta["error_count"]
+                total_videos_exported += video_count
+                total_errors += error_count
+                completed_files.append((batch_filename, video_count, error_count))
 
     print(f"✅ Completed {len(completed_files)}/{expected_batches} batch files")
     print(f"📊 Total videos exported: {total_videos_exported}")
@@ -410,7 +463,7 @@ print("Features:")
 print("✅ Resume from where you left off")
 print("✅ Automatic error recovery")
 print("✅ Channel data reloading on errors")
-print("✅ Batch retries with progressive delays")
+print("✅ Batch retries with exponential backoff")
 print("✅ High error rate detection")
 print()
 
@@ -0,0 +1,393 @@
+"""
+Shared helpers for the batch export scripts: batch file naming, scanning,
+reading/writing, validation and per-video metadata extraction.
+"""
+
+import json
+import os
+import re
+import time
+from collections.abc import Iterator
+
+try:
+    import orjson
+
+    def dumps(obj, pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    loads = orjson.loads
+except ImportError:  # fall back to stdlib json when orjson is not installed
+
+    def dumps(obj, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+
+_VIDEOID_RE = re.compile(r"videoId=([a-zA-Z0-9_-]{11})")
+
+# Batch files (schema_version 2) store videos column-wise under "videos_soa",
+# one equally long list per field; zip(*columns) rebuilds the per-video rows.
+# The watch URL is not stored: it is video_url(video_id).
+# Legacy files (no schema_version) hold a "videos" list of per-video dicts.
+SOA_FIELDS = {
+    "title": "titles",
+    "duration": "durations",
+    "video_id": "video_ids",
+    "publish_date": "publish_dates",
+    "is_error": "error_flags",
+    "error_message": "error_messages",
+}
+
+CHANNEL_CACHE_FILENAME = ".channel_cache.json"
+
+
+def video_url(video_id: str) -> str:
+    """Watch URL of a video, derived from its video_id"""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+# -----------------------------------------------------------------------------
+# Batch files
+# -----------------------------------------------------------------------------
+
+
+def iter_batch_files(
+    output_dir: str, safe_name: str
+) -> Iterator[tuple[int, os.DirEntry]]:
+    """
+    Yield (batch_num, DirEntry) for every batch file in output_dir
+    Matches filenames like "AZ_Alkmaar_videos_005.json" in a single scandir pass
+    """
+    batch_re = re.compile(rf"^{re.escape(safe_name)}_(\d+)\.json$")
+
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            match = batch_re.match(entry.name)
+            if match:
+                yield int(match.group(1)), entry
+
+
+def find_last_completed_batch(
+    output_dir: str,
+    safe_name: str,
+    existing: dict | None = None,
+    verbose: bool = False,
+) -> int:
+    """
+    Find the highest completed batch number
+    existing: Optional {batch_num: DirEntry} from iter_batch_files to avoid a rescan
+    verbose: Also print the sorted list of all batch numbers found
+    Returns the batch number to start from (last_completed + 1)
+    """
+    if existing is None:
+        if not os.path.exists(output_dir):
+            return 1  # Start from batch 1 if directory doesn't exist
+
+        # Look for existing batch files
+        existing = dict(iter_batch_files(output_dir, safe_name))
+
+    # Single pass for both the count and the highest batch number
+    last_completed = 0
+    batch_count = 0
+    for batch_num in existing:
+        batch_count += 1
+        if batch_num > last_completed:
+            last_completed = batch_num
+
+    if batch_count == 0:
+        return 1  # No existing batches found
+
+    if verbose:
+        print(f"Found existing batches: {sorted(existing)}")
+    else:
+        print(f"Found {batch_count} existing batches")
+    print(f"Last completed batch: {last_completed}")
+    return last_completed + 1
+
+
+def meta_path(batch_filepath: str) -> str:
+    """Path of the .meta.json sidecar that summarizes a batch file"""
+    return batch_filepath[: -len(".json")] + ".meta.json"
+
+
+def video_columns(data: dict) -> dict[str, list]:
+    """
+    Return the videos of a parsed batch file as {field: list}
+    Understands both the "videos_soa" columns and the legacy "videos" list
+    """
+    if "videos_soa" in data:
+        videos_soa = data["videos_soa"]
+        return {field: videos_soa[column] for field, column in SOA_FIELDS.items()}
+
+    videos = data["videos"]
+    columns = {field: [v.get(field) for v in videos] for field in SOA_FIELDS}
+    # Legacy files have no is_error flag; fall back to the title marker
+    columns["is_error"] = [
+        v["is_error"] if "is_error" in v else v.get("title", "").startswith("ERROR:")
+        for v in videos
+    ]
+    return columns
+
+
+def build_batch_meta(data: dict) -> dict | None:
+    """
+    Summarize a parsed batch file for its .meta.json sidecar
+    Returns None if the file does not have the expected structure
+    """
+    if "batch_info" not in data:
+        return None
+    if "videos_soa" not in data and "videos" not in data:
+        return None
+
+    batch_info = data["batch_info"]
+    columns = video_columns(data)
+    video_count = len(columns["title"])
+    if any(len(column) != video_count for column in columns.values()):
+        return None  # Truncated or hand-edited file
+    if batch_info.get("videos_in_batch", video_count) != video_count:
+        return None
+
+    error_count = sum(columns["is_error"])
+    success_rate = (video_count - error_count) / video_count if video_count else 0
+    return {
+        "batch_number": batch_info.get("batch_number"),
+        "videos_in_batch": video_count,
+        "error_count": error_count,
+        "success_rate": success_rate,
+    }
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """
+    Write payload to path via a temporary file and os.replace, so a crash
+    mid-write never leaves a truncated file behind
+    The payload goes straight to the fd, bypassing Python's io buffering
+    """
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # Usually one write(2); loop in case the kernel accepts less per call
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def write_batch_meta(batch_filepath: str, meta: dict) -> None:
+    """Write the .meta.json sidecar next to a batch file"""
+    write_atomic(meta_path(batch_filepath), dumps(meta))
+
+
+def read_batch_meta(batch_filepath: str) -> dict | None:
+    """
+    Return the summary of a batch file, reading its .meta.json sidecar if present
+    Legacy batches without a sidecar are parsed once and get one written
+    Returns None if the batch file is missing or malformed
+    """
+    try:
+        with open(meta_path(batch_filepath), "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(batch_filepath, "rb") as f:
+            meta = build_batch_meta(loads(f.read()))
+    except Exception:
+        return None
+
+    if meta is not None:
+        try:
+            write_batch_meta(batch_filepath, meta)
+        except OSError:
+            pass  # Read-only output dir; the full file is parsed again next time
+
+    return meta
+
+
+def write_batch_file(
+    batch_filepath: str, batch_data: dict, meta: dict, pretty: bool = False
+) -> None:
+    """
+    Save a batch file together with its .meta.json summary
+    pretty: Indent the batch file for reading by hand (compact by default)
+    """
+    # Drop any stale summary, save batch file, then its summary. Both writes
+    # are atomic, so an existing batch file is always complete.
+    if os.path.exists(meta_path(batch_filepath)):
+        os.remove(meta_path(batch_filepath))
+
+    write_atomic(batch_filepath, dumps(batch_data, pretty))
+    write_batch_meta(batch_filepath, meta)
+
+
+def validate_batch_file(filepath: str, min_success_rate: float = 0.8) -> bool:
+    """
+    Check if a batch file is complete and valid
+    min_success_rate: Minimum percentage of successful videos required (0.8 = 80%)
+    """
+    meta = read_batch_meta(filepath)
+    if not meta or not meta["videos_in_batch"]:
+        return False
+
+    # File is valid if success rate is above threshold
+    return meta["success_rate"] >= min_success_rate
+
+
+# -----------------------------------------------------------------------------
+# Video metadata
+# -----------------------------------------------------------------------------
+
+
+def extract_video(yt_obj, video_index: int) -> tuple[dict, bool]:
+    """
+    Extract metadata for a single video
+    Returns (video_data: dict, failed: bool); failures get an ERROR placeholder
+    """
+    try:
+        video_id = getattr(yt_obj, "video_id", None)
+        if video_id is None:
+            match = _VIDEOID_RE.search(repr(yt_obj))
+            video_id = match.group(1) if match else f"unknown_{video_index}"
+
+        # Get publish date (a single, possibly network-backed, attribute lookup)
+        try:
+            pd = getattr(yt_obj, "publish_date", None)
+            publish_date = pd.isoformat() if pd else None
+        except Exception:
+            publish_date = None
+
+        # Create video entry
+        video_data = {
+            "title": getattr(yt_obj, "title", "Unknown Title"),
+            "duration": getattr(yt_obj, "length", 0),
+            "video_id": video_id,
+            "publish_date": publish_date,
+            "is_error": False,
+            "error_message": None,
+        }
+        return video_data, False
+
+    except Exception as e:
+        # Create a placeholder entry for failed videos
+        error_data = {
+            "title": f"ERROR: Failed to process video {video_index + 1}",
+            "duration": 0,
+            "video_id": f"error_{video_index}",
+            "publish_date": None,
+            "is_error": True,
+            "error_message": str(e)[:100],
+        }
+        return error_data, True
+
+
+# -----------------------------------------------------------------------------
+# Parquet export
+# -----------------------------------------------------------------------------
+
+
+def export_parquet(
+    output_dir: str, safe_name: str, expected_batches: int
+) -> str | None:
+    """
+    Combine all batch files into a single {safe_name}.parquet file
+    Each batch becomes one row group, stored column by column
+    Returns the Parquet path, or None if pyarrow is not installed
+    """
+    if pa is None:
+        print("⚠️  pyarrow is not installed - skipping Parquet export")
+        return None
+
+    schema = pa.schema(
+        [
+            ("batch_number", pa.int32()),
+            ("title", pa.string()),
+            ("duration", pa.int64()),
+            ("video_id", pa.string()),
+            ("publish_date", pa.string()),
+            ("is_error", pa.bool_()),
+            ("error_message", pa.string()),
+        ]
+    )
+    parquet_path = os.path.join(output_dir, f"{safe_name}.parquet")
+    existing = dict(iter_batch_files(output_dir, safe_name))
+
+    with pq.ParquetWriter(parquet_path, schema) as writer:
+        for batch_num in range(1, expected_batches + 1):
+            entry = existing.get(batch_num)
+            if entry is None:
+                continue
+
+            try:
+                with open(entry.path, "rb") as f:
+                    columns = video_columns(loads(f.read()))
+            except Exception:
+                continue
+
+            columns["batch_number"] = [batch_num] * len(columns["title"])
+            writer.write_table(pa.table(columns, schema=schema))
+
+    print(f"📦 Parquet export: {parquet_path}")
+    return parquet_path
+
+
+# -----------------------------------------------------------------------------
+# Channel listing cache
+# -----------------------------------------------------------------------------
+
+
+def save_channel_cache(
+    output_dir: str, channel_url: str, channel_name: str, youtube_objects: list
+) -> None:
+    """
+    Cache the channel listing so a resume with nothing left to do can skip it
+    """
+    cache = {
+        "channel_url": channel_url,
+        "channel_name": channel_name,
+        "video_urls": [yt_obj.watch_url for yt_obj in youtube_objects],
+        "fetched_at": time.time(),
+    }
+    write_atomic(os.path.join(output_dir, CHANNEL_CACHE_FILENAME), dumps(cache))
+
+
+def load_channel_cache(
+    output_dir: str, channel_url: str, max_age_hours: float = 24
+) -> dict | None:
+    """
+    Return the cached channel listing
+    Returns None if it is missing, older than max_age_hours or for another channel
+    """
+    try:
+        with open(os.path.join(output_dir, CHANNEL_CACHE_FILENAME), "rb") as f:
+            cache = loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("channel_url") != channel_url:
+        return None
+    if time.time() - cache.get("fetched_at", 0) > max_age_hours * 3600:
+        return None
+    return cache
+
+
+def invalidate_channel_cache(output_dir: str) -> None:
+    """Remove the cached channel listing, e.g. after a batch failure"""
+    cache_path = os.path.join(output_dir, CHANNEL_CACHE_FILENAME)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
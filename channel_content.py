@@ -1,66 +1,30 @@
 from pytubefix import Channel
-import json
-import re
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-
-def find_last_completed_batch(output_dir, safe_name):
-    """
-    Find the highest completed batch number
-    Returns the batch number to start from (last_completed + 1)
-    """
-    if not os.path.exists(output_dir):
-        return 1  # Start from batch 1 if directory doesn't exist
-
-    completed_batches = []
-
-    # Look for existing batch files
-    for filename in os.listdir(output_dir):
-        if filename.startswith(f"{safe_name}_") and filename.endswith(".json"):
-            try:
-                # Extract batch number from filename like "AZ_Alkmaar_videos_005.json"
-                batch_part = filename.replace(f"{safe_name}_", "").replace(".json", "")
-                batch_num = int(batch_part)
-                completed_batches.append(batch_num)
-            except ValueError:
-                continue
-
-    if completed_batches:
-        last_completed = max(completed_batches)
-        print(f"Found existing batches: {sorted(completed_batches)}")
-        print(f"Last completed batch: {last_completed}")
-        return last_completed + 1
-    else:
-        return 1  # No existing batches found
-
-
-def validate_batch_file(filepath):
-    """
-    Check if a batch file is complete and valid
-    """
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Check if it has the expected structure
-        if "batch_info" in data and "videos" in data:
-            video_count = len(data["videos"])
-            expected_count = data.get("batch_info", {}).get("videos_in_batch", 0)
-
-            # File is valid if it has videos and structure is correct
-            return video_count > 0 and video_count == expected_count
-
-        return False
-
-    except Exception:
-        return False
-
-
-def run_batch_export_with_resume():
+from batch_io import (
+    SOA_FIELDS,
+    export_parquet,
+    extract_video,
+    find_last_completed_batch,
+    iter_batch_files,
+    load_channel_cache,
+    read_batch_meta,
+    save_channel_cache,
+    validate_batch_file,
+    write_batch_file,
+)
+
+
+def run_batch_export_with_resume(pretty=False, output_format="json"):
     """
     Batch export with resume functionality
     Skips existing valid batches and continues from where it left off
+    pretty: Indent batch files for reading by hand (compact by default)
+    output_format: "parquet" also combines all batches into one Parquet file
     """
 
     # Settings
@@ -68,13 +32,36 @@ def run_batch_export_with_resume():
     batch_size = 100
     output_dir = "./video_batches"
     safe_name = "AZ_Alkmaar_videos"
+    max_workers = 16  # videos whose metadata is fetched concurrently
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
+    # A fresh cached listing whose batches are all valid on disk makes the
+    # (slow) live channel listing unnecessary
+    cache = load_channel_cache(output_dir, channel_url)
+    if cache is not None:
+        total_batches = (len(cache["video_urls"]) + batch_size - 1) // batch_size
+        existing = dict(iter_batch_files(output_dir, safe_name))
+        if all(
+            batch_num in existing
+            and validate_batch_file(existing[batch_num].path, min_success_rate=0)
+            for batch_num in range(1, total_batches + 1)
+        ):
+            print(f"Channel: {cache['channel_name']} (cached listing)")
+            print(f"All {total_batches} batches are already completed")
+            show_final_summary(
+                output_dir, safe_name, total_batches, len(cache["video_urls"])
+            )
+
+            if output_format == "parquet":
+                export_parquet(output_dir, safe_name, total_batches)
+            return
+
     print("🔴⚪ Loading AZTV channel...")
     channel = Channel(channel_url)
     youtube_objects = list(channel.video_urls)
+    save_channel_cache(output_dir, channel_url, channel.channel_name, youtube_objects)
 
     total_videos = len(youtube_objects)
     total_batches = (total_videos + batch_size - 1) // batch_size
@@ -83,8 +70,10 @@ def run_batch_export_with_resume():
     print(f"Total videos: {total_videos}")
     print(f"Total batches needed: {total_batches}")
 
-    # Check for existing batches and find where to resume
-    start_batch = find_last_completed_batch(output_dir, safe_name)
+    # Scan existing batches once and find where to resume
+    existing = dict(iter_batch_files(output_dir, safe_name))
+    start_batch = find_last_completed_batch(output_dir, safe_name, existing)
+    validated = {}  # batch_num -> validate_batch_file result, parsed once per run
 
     if start_batch > 1:
         print(f"🔄 RESUMING from batch {start_batch}")
@@ -93,11 +82,14 @@ def run_batch_export_with_resume():
         print("Validating existing batch files...")
         for batch_num in range(1, start_batch):
             batch_filename = f"{safe_name}_{batch_num:03d}.json"
-            batch_filepath = os.path.join(output_dir, batch_filename)
+            entry = existing.get(batch_num)
 
-            if os.path.exists(batch_filepath):
-                if validate_batch_file(batch_filepath):
-                    file_size = os.path.getsize(batch_filepath)
+            if entry is not None:
+                validated[batch_num] = validate_batch_file(
+                    entry.path, min_success_rate=0
+                )
+                if validated[batch_num]:
+                    file_size = entry.stat().st_size
                     print(
                         f"  ✅ Batch {batch_num:2d}: {batch_filename} ({file_size // 1024:.0f} KB)"
                     )
@@ -127,8 +119,14 @@ def run_batch_export_with_resume():
         batch_filepath = os.path.join(output_dir, batch_filename)
 
         # Skip if file already exists and is valid
-        if os.path.exists(batch_filepath) and validate_batch_file(batch_filepath):
-            file_size = os.path.getsize(batch_filepath)
+        entry = existing.get(batch_num)
+        is_valid = validated.get(batch_num)
+        if is_valid is None:
+            is_valid = entry is not None and validate_batch_file(
+                entry.path, min_success_rate=0
+            )
+        if is_valid:
+            file_size = entry.stat().st_size
             print(
                 f"Batch {batch_num:2d}/{total_batches} | SKIPPED (already exists, {file_size // 1024:.0f} KB)"
             )
@@ -142,61 +140,39 @@ def run_batch_export_with_resume():
         progress_interval = max(1, len(current_batch) // 50)
         print("Progress: [", end="", flush=True)
 
-        batch_videos = []
+        batch_videos = {column: [] for column in SOA_FIELDS.values()}
 
-        # Process each video
-        for i, yt_obj in enumerate(current_batch):
-            try:
-                # Show progress
-                if i % progress_interval == 0 or i == len(current_batch) - 1:
-                    print("█", end="", flush=True)
+        # Extract video info in parallel; map() keeps results in batch order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                extract_video, current_batch, range(start_idx, end_idx)
+            )
 
-                # Extract video info
-                obj_repr = repr(yt_obj)
-                match = re.search(r"videoId=([a-zA-Z0-9_-]{11})", obj_repr)
-                video_id = match.group(1) if match else f"unknown_{start_idx + i}"
+            last_flush = time.monotonic()
 
-                # Get publish date
-                publish_date = None
-                try:
-                    if hasattr(yt_obj, "publish_date") and yt_obj.publish_date:
-                        publish_date = yt_obj.publish_date.isoformat()
-                except:
-                    pass
-
-                # Create video entry
-                video_data = {
-                    "title": getattr(yt_obj, "title", "Unknown Title"),
-                    "duration": getattr(yt_obj, "length", 0),
-                    "video_id": video_id,
-                    "url": f"https://www.youtube.com/watch?v={video_id}",
-                    "publish_date": publish_date,
-                }
-
-                batch_videos.append(video_data)
-
-            except Exception as e:
-                print("!", end="", flush=True)  # Error indicator
-                # Create a placeholder entry for failed videos
-                batch_videos.append(
-                    {
-                        "title": f"ERROR: Failed to process video {start_idx + i + 1}",
-                        "duration": 0,
-                        "video_id": f"error_{start_idx + i}",
-                        "url": f"ERROR: {str(e)[:100]}",
-                        "publish_date": None,
-                    }
-                )
-                continue
+            for i, (video_data, failed) in enumerate(results):
+                # Show progress, flushing stdout at most every 0.2 seconds
+                if i % progress_interval == 0 or i == len(current_batch) - 1:
+                    print("█", end="")
+                if time.monotonic() - last_flush > 0.2:
+                    sys.stdout.flush()
+                    last_flush = time.monotonic()
+                if failed:
+                    print("!", end="")  # Error indicator
+
+                for field, column in SOA_FIELDS.items():
+                    batch_videos[column].append(video_data[field])
 
         print("] ✓")
+        video_count = len(batch_videos["titles"])
 
         # Create batch data
         batch_data = {
+            "schema_version": 2,
             "batch_info": {
                 "batch_number": batch_num,
                 "total_batches": total_batches,
-                "videos_in_batch": len(batch_videos),
+                "videos_in_batch": video_count,
                 "video_range": f"{start_idx + 1}-{end_idx}",
                 "export_date": datetime.now().isoformat(),
             },
@@ -205,24 +181,34 @@ def run_batch_export_with_resume():
                 "url": channel_url,
                 "total_videos_in_channel": total_videos,
             },
-            "videos": batch_videos,
+            "videos_soa": batch_videos,
         }
 
+        successful_videos = video_count - sum(batch_videos["error_flags"])
+
         # Save batch file
-        with open(batch_filepath, "w", encoding="utf-8") as f:
-            json.dump(batch_data, f, indent=2, ensure_ascii=False)
+        write_batch_file(
+            batch_filepath,
+            batch_data,
+            {
+                "batch_number": batch_num,
+                "videos_in_batch": video_count,
+                "error_count": video_count - successful_videos,
+                "success_rate": successful_videos / video_count
+                if video_count
+                else 0,
+            },
+            pretty,
+        )
 
         # Show file info
         file_size = os.path.getsize(batch_filepath)
-        successful_videos = len(
-            [v for v in batch_videos if not v["title"].startswith("ERROR:")]
-        )
         print(
-            f"   ✅ Saved: {batch_filename} ({successful_videos}/{len(batch_videos)} videos, {file_size // 1024:.0f} KB)"
+            f"   ✅ Saved: {batch_filename} ({successful_videos}/{video_count} videos, {file_size // 1024:.0f} KB)"
         )
 
         # If we had errors, show them
-        failed_videos = len(batch_videos) - successful_videos
+        failed_videos = video_count - successful_videos
         if failed_videos > 0:
             print(f"   ⚠️  {failed_videos} videos had errors in this batch")
 
@@ -230,34 +216,40 @@ def run_batch_export_with_resume():
     print("🎉 BATCH EXPORT COMPLETED!")
 
     # Show final summary
+    show_final_summary(output_dir, safe_name, total_batches, total_videos)
+
+    if output_format == "parquet":
+        export_parquet(output_dir, safe_name, total_batches)
+
+
+def show_final_summary(output_dir, safe_name, total_batches, total_videos):
+    """Show final export summary"""
     completed_files = []
     total_videos_exported = 0
 
+    existing = dict(iter_batch_files(output_dir, safe_name))
+
     for batch_num in range(1, total_batches + 1):
         batch_filename = f"{safe_name}_{batch_num:03d}.json"
-        batch_filepath = os.path.join(output_dir, batch_filename)
+        entry = existing.get(batch_num)
 
-        if os.path.exists(batch_filepath):
-            try:
-                with open(batch_filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    video_count = len(data.get("videos", []))
-                    total_videos_exported += video_count
-                    completed_files.append((batch_filename, video_count))
-            except:
-                pass
+        if entry is not None:
+            meta = read_batch_meta(entry.path)
+            if meta is not None:
+                video_count = meta["videos_in_batch"]
+                total_videos_exported += video_count
+                completed_files.append((batch_filename, video_count))
 
     print(f"✅ Created {len(completed_files)}/{total_batches} batch files")
     print(f"📊 Total videos exported: {total_videos_exported}/{total_videos}")
     print(f"📁 Location: {output_dir}/")
 
     # Show missing batches if any
-    missing_batches = []
-    for batch_num in range(1, total_batches + 1):
-        batch_filename = f"{safe_name}_{batch_num:03d}.json"
-        batch_filepath = os.path.join(output_dir, batch_filename)
-        if not os.path.exists(batch_filepath):
-            missing_batches.append(batch_num)
+    missing_batches = [
+        batch_num
+        for batch_num in range(1, total_batches + 1)
+        if batch_num not in existing
+    ]
 
     if missing_batches:
         print(f"⚠️  Missing batches: {missing_batches}")
@@ -286,20 +278,19 @@ def show_export_status():
     completed_batches = []
     invalid_batches = []
 
+    existing = dict(iter_batch_files(output_dir, safe_name))
+
     for batch_num in range(1, expected_batches + 1):
-        batch_filename = f"{safe_name}_{batch_num:03d}.json"
-        batch_filepath = os.path.join(output_dir, batch_filename)
+        entry = existing.get(batch_num)
 
-        if os.path.exists(batch_filepath):
-            if validate_batch_file(batch_filepath):
+        if entry is not None:
+            if validate_batch_file(entry.path, min_success_rate=0):
                 completed_batches.append(batch_num)
 
-                # Show file info
+                # Show file info (the summary is cached after validation)
                 try:
-                    with open(batch_filepath, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        video_count = len(data.get("videos", []))
-                    file_size = os.path.getsize(batch_filepath)
+                    video_count = read_batch_meta(entry.path)["videos_in_batch"]
+                    file_size = entry.stat().st_size
                     print(
                         f"✅ Batch {batch_num:2d}: {video_count} videos ({file_size // 1024:.0f} KB)"
                     )
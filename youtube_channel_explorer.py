@@ -1,9 +1,161 @@
 from pytubefix import Channel
-import json
-import re
+import io
 import os
+import socket
+import string
+import sys
+import threading
 import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.error import HTTPError, URLError
+
+from batch_io import dumps, iter_batch_files, loads, write_atomic
+
+try:
+    import ijson
+except ImportError:  # streaming validation is optional
+    ijson = None
+
+try:
+    from tqdm import tqdm
+except ImportError:  # falls back to the plain text progress bar
+    tqdm = None
+
+try:
+    import urllib3
+except ImportError:  # connection reuse is optional
+    urllib3 = None
+
+# Batch filename prefixes keep letters, digits, underscore and dash; spaces
+# become underscores and any other ASCII character is dropped
+_SAFE_FN_CHARS = set(string.ascii_letters + string.digits + "_-")
+_SAFE_FN_TABLE = str.maketrans(
+    {chr(c): None for c in range(128) if chr(c) not in _SAFE_FN_CHARS} | {" ": "_"}
+)
+
+# Per-video fields, in the order of the row tuples built by _extract_one
+_VIDEO_FIELDS = ("title", "duration", "video_id", "url", "publish_date")
+
+# urllib3 pool shared by all pytubefix requests while _use_pooled_connections
+# is in effect, and the pytubefix function it replaces
+_http_pool = None
+_default_execute_request = None
+
+
+class _PooledResponse:
+    """The part of a urlopen() response that pytubefix uses: read() and info()."""
+
+    def __init__(self, response):
+        self._body = io.BytesIO(response.data)
+        self._headers = response.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._body.read(amt)
+
+    def info(self):
+        return self._headers
+
+
+def _url_error(e: Exception) -> URLError:
+    """
+    Convert a urllib3 error into the URLError urlopen would raise.
+    pytubefix's request.stream() only retries a URLError whose reason is a
+    socket.timeout or OSError, so the reason is the socket-level error.
+    """
+    if isinstance(e, urllib3.exceptions.MaxRetryError) and e.reason is not None:
+        e = e.reason
+    if isinstance(e, urllib3.exceptions.NewConnectionError):
+        return URLError(ConnectionError(str(e)))
+    if isinstance(e, urllib3.exceptions.TimeoutError):
+        return URLError(socket.timeout(str(e)))
+    if isinstance(e, urllib3.exceptions.ProtocolError):
+        return URLError(ConnectionError(str(e)))
+    return URLError(e)
+
+
+def _use_pooled_connections(maxsize: int) -> bool:
+    """
+    Route pytubefix's HTTP requests through one urllib3 PoolManager.
+    pytubefix opens a new connection (TCP + TLS handshake) per request via
+    urlopen; the pool keeps connections alive and reuses them across threads.
+    Undone by _restore_default_connections.
+    Returns False if urllib3 is not installed, or if a urllib opener is
+    installed (e.g. by pytubefix.helpers.install_proxy), as the pool would
+    bypass it.
+    """
+    global _http_pool, _default_execute_request
+
+    if urllib3 is None:
+        return False
+    if _http_pool is not None:
+        return True
+    if urllib.request._opener is not None:
+        return False
+
+    from pytubefix import request
+
+    # A handful of hosts (www.youtube.com, ...), maxsize connections each
+    _http_pool = urllib3.PoolManager(num_pools=4, maxsize=maxsize, block=False)
+
+    def _execute_request(
+        url,
+        method=None,
+        headers=None,
+        data=None,
+        timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    ):
+        # Same request building as pytubefix.request._execute_request
+        base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+        if headers:
+            base_headers.update(headers)
+        if data and not isinstance(data, bytes):
+            data = dumps(data)
+        if not url.lower().startswith("http"):
+            raise ValueError("Invalid URL")
+
+        kwargs = {}
+        if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+            kwargs["timeout"] = timeout
+
+        # Raise the urllib errors pytubefix expects from urlopen
+        try:
+            response = _http_pool.request(
+                method or ("POST" if data else "GET"),
+                url,
+                body=data,
+                headers=base_headers,
+                **kwargs,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise _url_error(e) from e
+        if response.status >= 400:
+            raise HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+
+        return _PooledResponse(response)
+
+    _default_execute_request = request._execute_request
+    request._execute_request = _execute_request
+    return True
+
+
+def _restore_default_connections() -> None:
+    """Undo _use_pooled_connections: pytubefix goes back to urlopen."""
+    global _http_pool, _default_execute_request
+
+    if _http_pool is None:
+        return
+
+    from pytubefix import request
+
+    request._execute_request = _default_execute_request
+    _http_pool.clear()
+    _http_pool = None
+    _default_execute_request = None
 
 
 class YouTubeBatchExporter:
@@ -25,6 +177,8 @@ class YouTubeBatchExporter:
         file_prefix: str | None = None,
         max_batch_retries: int = 3,
         min_success_rate: float = 0.8,
+        max_workers: int = 16,
+        pooled_connections: bool = True,
     ):
         """
         :param channel_url: Full URL of the YouTube channel.
@@ -35,6 +189,11 @@ class YouTubeBatchExporter:
         :param max_batch_retries: How many times to retry a failing batch.
         :param min_success_rate: Minimum success rate for a batch file to be
                                  considered valid when resuming.
+        :param max_workers: Number of videos whose metadata is fetched concurrently.
+        :param pooled_connections: Reuse HTTP connections across pytubefix requests
+                                   during run() (needs urllib3; ignored if not
+                                   installed or if a urllib opener, e.g. a
+                                   proxy, is installed).
         """
         self.channel_url = channel_url
         self.batch_size = batch_size
@@ -42,11 +201,33 @@ class YouTubeBatchExporter:
         self.file_prefix = file_prefix
         self.max_batch_retries = max_batch_retries
         self.min_success_rate = min_success_rate
+        self.max_workers = max_workers
+        self.pooled_connections = pooled_connections
 
         # Filled when loading the channel
         self.channel: Channel | None = None
         self.youtube_objects: list = []
         self.channel_info: dict = {}
+        self._channel_info_json: bytes = dumps(self.channel_info)
+
+        # Batch filename prefix, computed once per channel load
+        self._cached_prefix: str | None = None
+
+        # Running totals of the batches written by this run, for the summary
+        self._total_videos_exported = 0
+        self._total_errors = 0
+        self._completed_files: list[tuple[str, int, int]] = []
+        self._written_batches: set[int] = set()
+
+        # Batches recorded as valid in the progress checkpoint
+        self._valid_batches: set[int] = set()
+        self._progress_timestamp: float = 0.0
+
+        # Thread pool for per-video extraction, shared by all batches of a run
+        self._pool: ThreadPoolExecutor | None = None
+
+        # Set on Ctrl-C or by stop(); retry waits use it so they can be interrupted
+        self._stop = threading.Event()
 
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
@@ -58,30 +239,123 @@ class YouTubeBatchExporter:
     @staticmethod
     def _make_safe_filename_part(name: str) -> str:
         """Create a filesystem-safe slug from the given name."""
-        name = name.strip().replace(" ", "_")
-        # keep only letters, digits, underscore and dash
-        return re.sub(r"[^A-Za-z0-9_-]+", "", name) or "youtube_channel"
+        # drop non-ASCII, then keep only letters, digits, underscore and dash
+        name = name.strip().encode("ascii", "ignore").decode("ascii")
+        return name.translate(_SAFE_FN_TABLE) or "youtube_channel"
 
     def _batch_file_prefix(self) -> str:
         """
         Return the prefix to use for batch files.
         If file_prefix is not set, derive it from the channel name.
+        The result is cached until the channel is reloaded.
         """
-        if self.file_prefix:
-            return self.file_prefix
+        if self._cached_prefix is not None:
+            return self._cached_prefix
 
-        if self.channel is not None and getattr(self.channel, "channel_name", None):
-            return self._make_safe_filename_part(self.channel.channel_name)
+        if self.file_prefix:
+            self._cached_prefix = self.file_prefix
+        elif self.channel is not None and getattr(self.channel, "channel_name", None):
+            self._cached_prefix = self._make_safe_filename_part(
+                self.channel.channel_name
+            )
+        else:
+            # fallback if channel is not yet loaded (not cached)
+            return "youtube_channel"
 
-        # fallback if channel is not yet loaded
-        return "youtube_channel"
+        return self._cached_prefix
 
     def _batch_filename(self, batch_num: int) -> str:
         return f"{self._batch_file_prefix()}_{batch_num:03d}.json"
 
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Return the extraction thread pool, creating it on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _progress_path(self) -> str:
+        """Path of the checkpoint file that records completed batches."""
+        return os.path.join(
+            self.output_dir, f"{self._batch_file_prefix()}.progress.json"
+        )
+
+    def _load_progress(self, max_age_hours: float | None = 24) -> dict | None:
+        """
+        Return the progress checkpoint for this channel.
+        Returns None if it is missing, unreadable, older than max_age_hours
+        (unless None) or written for another channel.
+        """
+        try:
+            with open(self._progress_path(), "rb") as f:
+                progress = loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if progress.get("channel", {}).get("url") != self.channel_url:
+            return None
+        if (
+            max_age_hours is not None
+            and time.time() - progress.get("timestamp", 0) > max_age_hours * 3600
+        ):
+            return None
+        return progress
+
+    def _save_progress(self, batch_num: int) -> None:
+        """Record batch_num as completed in the progress checkpoint."""
+        self._valid_batches.add(batch_num)
+
+        # Batches can finish out of order (a failed one is retried after the
+        # others), so last_completed ends the unbroken run from batch 1
+        last_completed = 0
+        while last_completed + 1 in self._valid_batches:
+            last_completed += 1
+
+        progress = {
+            "last_completed": last_completed,
+            "valid_batches": sorted(self._valid_batches),
+            "min_success_rate": self.min_success_rate,
+            "channel": self.channel_info,
+            "timestamp": time.time(),
+        }
+        write_atomic(self._progress_path(), dumps(progress))
+
+    def _is_known_valid(self, batch_num: int, entry: os.DirEntry) -> bool:
+        """
+        True if the progress checkpoint lists batch_num as valid (at a
+        min_success_rate at least ours) and its file has not been modified
+        since the checkpoint was written.
+        """
+        return (
+            batch_num in self._valid_batches
+            and entry.stat().st_mtime <= self._progress_timestamp
+        )
+
+    def _load_valid_batches(self, existing: dict[int, os.DirEntry]) -> None:
+        """
+        Load the batches the progress checkpoint lists as valid, keeping
+        those whose files are in existing.
+        The checkpoint's age doesn't matter here: _is_known_valid only trusts
+        files not modified since it was written.
+        """
+        self._valid_batches = set()
+        self._progress_timestamp = 0.0
+
+        progress = self._load_progress(max_age_hours=None)
+        if progress is None:
+            return
+
+        # Only trust batches checked against at least our threshold;
+        # checkpoints without one may list batches below it
+        if progress.get("min_success_rate", 0) < self.min_success_rate:
+            return
+
+        self._valid_batches = set(progress["valid_batches"]).intersection(existing)
+        self._progress_timestamp = progress["timestamp"]
+
     def find_last_completed_batch(self) -> int:
         """
         Find the highest completed batch number in output_dir for this prefix.
+        Uses the progress checkpoint if it is fresh, else scans output_dir.
         Returns the batch number to start from (last_completed + 1).
         """
         prefix = self._batch_file_prefix()
@@ -89,26 +363,67 @@ class YouTubeBatchExporter:
         if not os.path.exists(self.output_dir):
             return 1  # Start from batch 1 if directory doesn't exist
 
-        completed_batches = []
+        # A fresh checkpoint avoids scanning the directory, as long as the
+        # batch it names as last completed is still on disk
+        progress = self._load_progress()
+        if progress is not None:
+            last_completed = progress["last_completed"]
+            batch_filepath = os.path.join(
+                self.output_dir, self._batch_filename(last_completed)
+            )
+            if last_completed == 0 or os.path.exists(batch_filepath):
+                print(f"Last completed batch (from checkpoint): {last_completed}")
+                return last_completed + 1
 
-        # Look for existing batch files
-        for filename in os.listdir(self.output_dir):
-            if filename.startswith(f"{prefix}_") and filename.endswith(".json"):
-                try:
-                    # Extract batch number from filename like "<prefix>_005.json"
-                    batch_part = filename.replace(f"{prefix}_", "").replace(".json", "")
-                    batch_num = int(batch_part)
-                    completed_batches.append(batch_num)
-                except ValueError:
-                    continue
+        # Look for existing batch files like "<prefix>_005.json"
+        completed_batches = [
+            batch_num for batch_num, _ in iter_batch_files(self.output_dir, prefix)
+        ]
 
-        if completed_batches:
-            last_completed = max(completed_batches)
+        last_completed = max(completed_batches, default=0)
+        if last_completed:
             print(f"Found existing batches: {sorted(completed_batches)}")
             print(f"Last completed batch: {last_completed}")
-            return last_completed + 1
-        else:
-            return 1  # No existing batches found
+        return last_completed + 1  # 1 if no existing batches were found
+
+    @staticmethod
+    def _count_batch_videos(f) -> tuple[int, int] | None:
+        """
+        Count (videos, error_videos) in an open binary batch file.
+        Streams the file with ijson when available instead of loading it whole.
+        Returns None if the file does not have the expected structure.
+        """
+        if ijson is None:
+            data = loads(f.read())
+            if "batch_info" not in data or "videos" not in data:
+                return None
+
+            videos = data["videos"]
+            error_videos = 0
+            for v in videos:
+                title = v.get("title")
+                if title is not None and title.startswith("ERROR:"):
+                    error_videos += 1
+            return len(videos), error_videos
+
+        has_batch_info = has_videos = False
+        video_count = error_videos = 0
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "videos.item.title":
+                if event == "string" and value.startswith("ERROR:"):
+                    error_videos += 1
+            elif prefix == "videos.item":
+                if event == "start_map":
+                    video_count += 1
+            elif prefix == "" and event == "map_key":
+                if value == "batch_info":
+                    has_batch_info = True
+                elif value == "videos":
+                    has_videos = True
+
+        if not (has_batch_info and has_videos):
+            return None
+        return video_count, error_videos
 
     def validate_batch_file(self, filepath: str) -> bool:
         """
@@ -116,26 +431,23 @@ class YouTubeBatchExporter:
         Uses self.min_success_rate as minimum success threshold.
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(filepath, "rb") as f:
+                counts = self._count_batch_videos(f)
 
             # Check if it has the expected structure
-            if "batch_info" in data and "videos" in data:
-                videos = data["videos"]
-                if not videos:
-                    return False
-
-                # Count successful vs error videos
-                error_videos = len(
-                    [v for v in videos if v.get("title", "").startswith("ERROR:")]
-                )
-                success_videos = len(videos) - error_videos
-                success_rate = success_videos / len(videos) if videos else 0
+            if counts is None:
+                return False
 
-                # File is valid if success rate is above threshold
-                return success_rate >= self.min_success_rate
+            video_count, error_videos = counts
+            if not video_count:
+                return False
 
-            return False
+            # Count successful vs error videos
+            success_videos = video_count - error_videos
+            success_rate = success_videos / video_count
+
+            # File is valid if success rate is above threshold
+            return success_rate >= self.min_success_rate
 
         except Exception:
             return False
@@ -145,6 +457,7 @@ class YouTubeBatchExporter:
         Safely load channel with retries and error handling.
         Populates self.channel, self.youtube_objects and self.channel_info.
         """
+        self._cached_prefix = None
 
         for attempt in range(max_retries):
             try:
@@ -167,12 +480,15 @@ class YouTubeBatchExporter:
                     "url": self.channel_url,
                     "total_videos_in_channel": len(youtube_objects),
                 }
+                # Identical in every batch file, so it is serialized only once
+                self._channel_info_json = dumps(self.channel_info)
 
                 # If no explicit prefix was provided, we can now derive it
                 if self.file_prefix is None:
                     self.file_prefix = self._make_safe_filename_part(
                         channel.channel_name or "youtube_channel"
                     )
+                self._cached_prefix = self.file_prefix
 
                 return
 
@@ -181,11 +497,86 @@ class YouTubeBatchExporter:
                 if attempt < max_retries - 1:
                     wait_time = (attempt + 1) * 5  # Progressive delay: 5, 10, 15 sec
                     print(f"Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
+                    if self._stop.wait(wait_time):
+                        raise e  # interrupted; don't try again
                 else:
                     print("All attempts to load channel failed.")
                     raise e
 
+    @staticmethod
+    def _extract_one(idx: int, yt_obj) -> tuple[tuple, bool]:
+        """
+        Extract metadata for a single video (idx is its position in the channel).
+        Returns (row, failed), row holding the _VIDEO_FIELDS values; failures
+        get an ERROR placeholder row.
+        """
+        try:
+            # Extract video info; pytubefix exposes the ID directly
+            video_id = getattr(yt_obj, "video_id", None)
+            if not video_id:
+                watch_url = getattr(yt_obj, "watch_url", None)
+                if watch_url and "v=" in watch_url:
+                    video_id = watch_url.rsplit("v=", 1)[-1][:11]
+                else:
+                    video_id = f"unknown_{idx}"
+
+            # Each (possibly network-backed) property is read exactly once
+            title = getattr(yt_obj, "title", "Unknown Title")
+            length = getattr(yt_obj, "length", 0)
+            try:
+                pd = getattr(yt_obj, "publish_date", None)
+                publish_date = pd.isoformat() if pd else None
+            except Exception:
+                publish_date = None
+
+            # Create video row; dicts are only built when the batch is saved
+            row = (
+                title,
+                length,
+                video_id,
+                f"https://www.youtube.com/watch?v={video_id}",
+                publish_date,
+            )
+            return row, False
+
+        except Exception as e:
+            error_row = (
+                f"ERROR: Failed to process video {idx + 1}",
+                0,
+                f"error_{idx}",
+                f"ERROR: {str(e)[:100]}",
+                None,
+            )
+            return error_row, True
+
+    def _write_batch(
+        self, batch_filepath: str, batch_info: dict, batch_videos: list[tuple]
+    ) -> None:
+        """
+        Stream a batch file to disk one video at a time, splicing in the
+        pre-serialized channel_info.
+        Layout: {"batch_info": ..., "channel_info": ..., "videos": [...]}
+        Written to a temporary file and moved into place with os.replace, so a
+        crash mid-write never leaves a truncated batch file behind.
+        """
+        tmp_path = batch_filepath + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b'{"batch_info":')
+            f.write(dumps(batch_info))
+            f.write(b',"channel_info":')
+            f.write(self._channel_info_json)
+            f.write(b',"videos":[')
+
+            # Each video dict only lives long enough to be encoded
+            sep = b""
+            for row in batch_videos:
+                f.write(sep)
+                f.write(dumps(dict(zip(_VIDEO_FIELDS, row))))
+                sep = b","
+
+            f.write(b"]}")
+        os.replace(tmp_path, batch_filepath)
+
     def process_single_batch(
         self,
         batch_num: int,
@@ -193,6 +584,7 @@ class YouTubeBatchExporter:
     ):
         """
         Process a single batch with error recovery.
+        Videos are fetched concurrently on self.max_workers threads.
         Returns (success: bool, error_count: int, retry_needed: bool)
         """
 
@@ -207,69 +599,71 @@ class YouTubeBatchExporter:
             f"Batch {batch_num} | Videos {start_idx + 1:4d}-{end_idx:4d} | Processing..."
         )
 
-        # Progress bar setup
-        progress_interval = max(1, len(current_batch) // 50)
-        print("Progress: [", end="", flush=True)
-
-        batch_videos = []
-        error_count = 0
-        consecutive_errors = 0
-
-        # Process each video
-        for i, yt_obj in enumerate(current_batch):
-            try:
-                # Show progress
-                if i % progress_interval == 0 or i == len(current_batch) - 1:
-                    print("█", end="", flush=True)
-
-                # Extract video info
-                obj_repr = repr(yt_obj)
-                match = re.search(r"videoId=([a-zA-Z0-9_-]{11})", obj_repr)
-                video_id = match.group(1) if match else f"unknown_{start_idx + i}"
+        # Progress bar setup: tqdm repaints at most every 0.25 s; the plain
+        # bar flushes stdout at most every 0.2 s
+        pbar = None
+        if tqdm is not None:
+            pbar = tqdm(
+                total=len(current_batch),
+                desc=f"batch {batch_num}",
+                mininterval=0.25,
+                leave=False,
+            )
+        else:
+            progress_interval = max(1, len(current_batch) // 50)
+            print("Progress: [", end="", flush=True)
+            last_flush = time.monotonic()
+
+        # Results are stored by position, so the batch keeps the channel order
+        batch_videos = [None] * len(current_batch)
+        failed_flags = [False] * len(current_batch)
+        completed = 0
+
+        executor = self._get_pool()
+        futures = {
+            executor.submit(self._extract_one, start_idx + i, yt_obj): i
+            for i, yt_obj in enumerate(current_batch)
+        }
 
-                # Get publish date
-                publish_date = None
-                try:
-                    if hasattr(yt_obj, "publish_date") and yt_obj.publish_date:
-                        publish_date = yt_obj.publish_date.isoformat()
-                except Exception:
-                    pass
+        for future in as_completed(futures):
+            i = futures[future]
+            batch_videos[i], failed_flags[i] = future.result()
 
-                # Create video entry
-                video_data = {
-                    "title": getattr(yt_obj, "title", "Unknown Title"),
-                    "duration": getattr(yt_obj, "length", 0),
-                    "video_id": video_id,
-                    "url": f"https://www.youtube.com/watch?v={video_id}",
-                    "publish_date": publish_date,
-                }
+            # Show progress (only this thread prints, so no lock is needed)
+            if pbar is not None:
+                pbar.update(1)
+                continue
 
-                batch_videos.append(video_data)
+            if completed % progress_interval == 0 or (
+                completed == len(current_batch) - 1
+            ):
+                print("█", end="")
+            if failed_flags[i]:
+                print("!", end="")  # Error indicator
+            if time.monotonic() - last_flush > 0.2:
+                sys.stdout.flush()
+                last_flush = time.monotonic()
+            completed += 1
+
+        if pbar is not None:
+            pbar.close()
+
+        # Count errors in batch order; too many in a row suggests a retry
+        error_count = 0
+        consecutive_errors = 0
+        for failed in failed_flags:
+            if not failed:
                 consecutive_errors = 0  # Reset
-
-            except Exception as e:
-                print("!", end="", flush=True)  # Error indicator
-                error_count += 1
-                consecutive_errors += 1
-
-                batch_videos.append(
-                    {
-                        "title": f"ERROR: Failed to process video {start_idx + i + 1}",
-                        "duration": 0,
-                        "video_id": f"error_{start_idx + i}",
-                        "url": f"ERROR: {str(e)[:100]}",
-                        "publish_date": None,
-                    }
-                )
-
-                # If too many consecutive errors, suggest a retry
-                if consecutive_errors >= 10:
-                    print(f"\n{consecutive_errors} consecutive errors detected.")
-                    return False, error_count, True  # retry_needed = True
-
                 continue
 
-        print("] done")
+            error_count += 1
+            consecutive_errors += 1
+            if consecutive_errors >= 10:
+                print(f"\n{consecutive_errors} consecutive errors detected.")
+                return False, error_count, True  # retry_needed = True
+
+        if pbar is None:
+            print("] done")
 
         # Check error rate
         success_rate = (
@@ -285,22 +679,17 @@ class YouTubeBatchExporter:
             return False, error_count, True
 
         # Create batch data
-        batch_data = {
-            "batch_info": {
-                "batch_number": batch_num,
-                "videos_in_batch": len(batch_videos),
-                "video_range": f"{start_idx + 1}-{end_idx}",
-                "export_date": datetime.now().isoformat(),
-                "error_count": error_count,
-                "success_rate": success_rate,
-            },
-            "channel_info": self.channel_info,
-            "videos": batch_videos,
+        batch_info = {
+            "batch_number": batch_num,
+            "videos_in_batch": len(batch_videos),
+            "video_range": f"{start_idx + 1}-{end_idx}",
+            "export_date": datetime.now().isoformat(),
+            "error_count": error_count,
+            "success_rate": success_rate,
         }
 
         # Save batch file
-        with open(batch_filepath, "w", encoding="utf-8") as f:
-            json.dump(batch_data, f, indent=2, ensure_ascii=False)
+        self._write_batch(batch_filepath, batch_info, batch_videos)
 
         # Show file info
         file_size = os.path.getsize(batch_filepath)
@@ -313,22 +702,42 @@ class YouTubeBatchExporter:
         if error_count > 0:
             print(f"{error_count} errors in this batch.")
 
+        self._total_videos_exported += len(batch_videos)
+        self._total_errors += error_count
+        self._completed_files.append((batch_filename, len(batch_videos), error_count))
+        self._written_batches.add(batch_num)
+
+        # Batches saved below min_success_rate are not recorded as valid, so
+        # a resume validates them again (and redoes them)
+        if success_rate >= self.min_success_rate:
+            self._save_progress(batch_num)
+
         return True, error_count, False  # Success, no retry needed
 
     def show_final_summary(self, expected_batches: int):
-        """Show final export summary"""
-        completed_files = []
-        total_videos_exported = 0
-        total_errors = 0
+        """
+        Show final export summary.
+        Batches written by this run come from the running totals; only batches
+        that already existed (resume) are read back from disk.
+        """
+        completed_files = list(self._completed_files)
+        total_videos_exported = self._total_videos_exported
+        total_errors = self._total_errors
+
+        # One scandir pass instead of an exists() check per batch
+        existing = dict(iter_batch_files(self.output_dir, self._batch_file_prefix()))
 
         for batch_num in range(1, expected_batches + 1):
+            if batch_num in self._written_batches:
+                continue
+
             batch_filename = self._batch_filename(batch_num)
-            batch_filepath = os.path.join(self.output_dir, batch_filename)
+            entry = existing.get(batch_num)
 
-            if os.path.exists(batch_filepath):
+            if entry is not None:
                 try:
-                    with open(batch_filepath, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    with open(entry.path, "rb", buffering=0) as f:
+                        data = loads(f.read())
                         video_count = len(data.get("videos", []))
                         error_count = data.get("batch_info", {}).get("error_count", 0)
                         total_videos_exported += video_count
@@ -352,21 +761,49 @@ class YouTubeBatchExporter:
         print(f"Output directory: {os.path.abspath(self.output_dir)}")
 
     # -------------------------------------------------------------------------
-    # Main public method
+    # Main public methods
     # -------------------------------------------------------------------------
 
+    def stop(self):
+        """
+        Ask a running export to stop, e.g. from another thread.
+        Pending retry waits return at once; run again to resume.
+        """
+        self._stop.set()
+
     def run(self):
         """
         Run the full batch export with error recovery:
         - Load channel
-        - Determine starting batch (resume support)
+        - Determine the batches still to do (resume support)
         - Process all batches
         - Show summary
         """
 
+        self._stop.clear()
+
+        # Totals for this run's summary; a second run() starts them afresh
+        self._total_videos_exported = 0
+        self._total_errors = 0
+        self._completed_files = []
+        self._written_batches = set()
+
         print("YouTube Video Metadata Batch Export")
         print("=" * 60)
 
+        # Keep-alive connections for all worker threads, plus headroom; only
+        # for the duration of this run
+        pooled = self.pooled_connections and _use_pooled_connections(
+            maxsize=self.max_workers * 2
+        )
+        try:
+            self._export()
+        finally:
+            if pooled:
+                _restore_default_connections()
+
+    def _export(self):
+        """Load the channel, process all batches and show the summary."""
         # Initial channel load
         try:
             self.load_channel_safely()
@@ -385,87 +822,114 @@ class YouTubeBatchExporter:
         print(f"Output directory: {os.path.abspath(self.output_dir)}")
         print("=" * 60)
 
-        # Check for existing batches and find where to resume
-        start_batch = self.find_last_completed_batch()
+        # Batch files present at startup; their DirEntry caches the size
+        existing = dict(iter_batch_files(self.output_dir, self._batch_file_prefix()))
+        self._load_valid_batches(existing)
+
+        # Batches can finish out of order, so every batch is checked rather
+        # than resuming after the highest one on disk. Valid batches are
+        # skipped; those the checkpoint lists as valid are not parsed again.
+        pending: deque[int] = deque()
+        for batch_num in range(1, total_batches + 1):
+            entry = existing.get(batch_num)
+            if entry is None:
+                pending.append(batch_num)
+                continue
 
-        if start_batch > 1:
-            print(f"Resuming from batch {start_batch}.")
+            if not self._is_known_valid(batch_num, entry):
+                if not self.validate_batch_file(entry.path):
+                    pending.append(batch_num)
+                    continue
+                self._save_progress(batch_num)
+
+            print(
+                f"Batch {batch_num:2d}/{total_batches} | "
+                f"SKIPPED (already exists, {entry.stat().st_size // 1024:.0f} KB)"
+            )
+
+        if not pending:
+            print(f"All {total_batches} batches are already completed.")
+        elif len(pending) < total_batches:
+            print(
+                f"Resuming: {len(pending)} of {total_batches} batches left, "
+                f"starting with batch {pending[0]}."
+            )
         else:
             print("Starting fresh export.")
 
         print("=" * 60)
 
-        # Process batches with error recovery
-        current_batch = start_batch
+        # Failed batches waiting for a retry, as (ready_at, batch_num,
+        # attempts). A failed batch is retried after the others have had
+        # their turn, so its retry delay doesn't stall them.
+        retries: deque[tuple[float, int, int]] = deque()
 
-        while current_batch <= total_batches:
-            batch_retry_count = 0
-            batch_success = False
-
-            # Retry loop for current batch
-            while batch_retry_count < self.max_batch_retries and not batch_success:
-                try:
-                    # Skip if file already exists and is valid
-                    batch_filename = self._batch_filename(current_batch)
-                    batch_filepath = os.path.join(self.output_dir, batch_filename)
-
-                    if os.path.exists(batch_filepath) and self.validate_batch_file(
-                        batch_filepath
-                    ):
-                        file_size = os.path.getsize(batch_filepath)
-                        print(
-                            f"Batch {current_batch:2d}/{total_batches} | "
-                            f"SKIPPED (already exists, {file_size // 1024:.0f} KB)"
-                        )
-                        batch_success = True
+        try:
+            while (pending or retries) and not self._stop.is_set():
+                if retries and (not pending or retries[0][0] <= time.monotonic()):
+                    ready_at, current_batch, attempts = retries.popleft()
+                    if self._stop.wait(max(0.0, ready_at - time.monotonic())):
                         break
+                else:
+                    current_batch, attempts = pending.popleft(), 0
 
+                try:
                     # Process the batch
                     success, error_count, retry_needed = self.process_single_batch(
                         current_batch
                     )
 
                     if success and not retry_needed:
-                        batch_success = True
+                        continue
+
+                    # Batch failed or needs retry
+                    attempts += 1
+
+                    if attempts < self.max_batch_retries:
+                        print(
+                            f"Batch {current_batch} needs retry "
+                            f"({attempts}/{self.max_batch_retries})."
+                        )
+                        print("Reloading channel data...")
+
+                        # Reload channel data to recover from connection issues
+                        try:
+                            self.load_channel_safely()
+                            print("Channel data reloaded successfully.")
+                        except Exception as e:
+                            print(f"Failed to reload channel: {e}")
+                            continue
+
+                        retries.append((time.monotonic() + 5, current_batch, attempts))
                     else:
-                        # Batch failed or needs retry
-                        batch_retry_count += 1
-
-                        if batch_retry_count < self.max_batch_retries:
-                            print(
-                                f"Batch {current_batch} needs retry "
-                                f"({batch_retry_count}/{self.max_batch_retries})."
-                            )
-                            print("Reloading channel data...")
-
-                            # Reload channel data to recover from connection issues
-                            try:
-                                self.load_channel_safely()
-                                print("Channel data reloaded successfully.")
-                                time.sleep(5)
-                            except Exception as e:
-                                print(f"Failed to reload channel: {e}")
-                                break
-                        else:
-                            print(
-                                f"Batch {current_batch} failed after "
-                                f"{self.max_batch_retries} retries. Continuing."
-                            )
-                            batch_success = True  # Allow continuation
+                        print(
+                            f"Batch {current_batch} failed after "
+                            f"{self.max_batch_retries} retries. Continuing."
+                        )
 
                 except Exception as e:
                     print(f"Unexpected error in batch {current_batch}: {e}")
-                    batch_retry_count += 1
+                    attempts += 1
 
-                    if batch_retry_count < self.max_batch_retries:
-                        print(f"Retrying batch {current_batch}...")
-                        time.sleep(5)
+                    if attempts < self.max_batch_retries:
+                        print(f"Retrying batch {current_batch} later...")
+                        retries.append((time.monotonic() + 5, current_batch, attempts))
                     else:
                         print(f"Giving up on batch {current_batch}. Continuing.")
-                        batch_success = True  # Allow continuation
 
-            # Move to next batch
-            current_batch += 1
+        except KeyboardInterrupt:
+            self._stop.set()
+
+        finally:
+            # Stop the extraction threads once all batches are done (or at once
+            # when interrupted)
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=self._stop.is_set())
+                self._pool = None
+
+        if self._stop.is_set():
+            print("\nExport interrupted. Run again to resume.")
+            return
 
         print("=" * 60)
         print("Export completed.")
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import os
-import re
 from pathlib import Path
 from typing import Optional
 
 from pytubefix import YouTube
 # from pytubefix.exceptions import PytubeError
 
+# Path separators become underscores, other problematic characters are removed
+_FILENAME_TABLE = str.maketrans({c: "_" for c in "\\/"} | {c: None for c in ':*?"<>|'})
+
 
 class YoutubeVideoDownloader:
     """
@@ -87,11 +89,8 @@ class YoutubeVideoDownloader:
         """
         Make sure the filename is filesystem-safe.
         """
-        # Replace path separators and illegal characters with underscores
-        name = re.sub(r"[\\/]", "_", name)
-        # Remove other problematic characters
-        name = re.sub(r'[:*?"<>|]+', "", name)
-        name = name.strip()
+        # Replace path separators and remove illegal characters in one pass
+        name = name.translate(_FILENAME_TABLE).strip()
         return name or "youtube_video"
 
     def _target_path_with_extension(self, base_filename: str, extension: str) -> Path: